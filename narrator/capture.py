@@ -1,42 +1,266 @@
 """Terminal output capture — log file and tmux pane modes."""
 
+import codecs
+import difflib
 import os
+import re
+import select
+import shlex
 import subprocess
 import sys
+import tempfile
+import time
 from typing import Optional
 
-from narrator.clean import clean_terminal_output, strip_ansi
+from narrator.clean import clean_terminal_output
 
 
-def capture_pane(pane: str, history_lines: int = 200) -> str:
-    """Capture the visible content (plus some scroll-back) of a tmux pane."""
+def capture_pane_raw(pane: str, history_lines: int = 200) -> bytes:
+    """Capture the visible content (plus some scroll-back) of a tmux pane.
+
+    Returns the undecoded tmux output, so callers can compare captures
+    before paying for decoding and cleanup.
+    """
     try:
         result = subprocess.run(
             ["tmux", "capture-pane", "-t", pane, "-p", "-S", f"-{history_lines}"],
             capture_output=True,
-            text=True,
             timeout=5,
         )
         if result.returncode != 0:
-            return ""
-        return strip_ansi(result.stdout)
+            return b""
+        return result.stdout
     except FileNotFoundError:
         print("Error: tmux is not installed or not in PATH.", file=sys.stderr)
         sys.exit(1)
     except subprocess.TimeoutExpired:
-        return ""
+        return b""
+
+
+class LogWatcher:
+    """Tail a log file, sleeping until it is written to or a timeout passes.
+
+    Keeps one read handle open across ticks, starting at the current end of
+    the file, so each read() only returns what was appended. Uses a kqueue
+    vnode watch where available (macOS/BSD) so new output is picked up as
+    soon as it is written; elsewhere it just sleeps.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._kq = None
+        self._fh = None
+        self._decoder = None
+        # Skip everything already in the file; a file created later is read
+        # from the start
+        self._reopen(at_end=True)
+
+    def _reopen(self, at_end: bool = False):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        try:
+            self._fh = open(self.path, "rb")
+        except OSError:
+            return
+        if at_end:
+            self._fh.seek(0, os.SEEK_END)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def read(self) -> str:
+        """Return cleaned text appended since the last read, or ""."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return ""
+        if self._fh is None or os.fstat(self._fh.fileno()).st_ino != st.st_ino:
+            # Created or replaced since the last read
+            self._reopen()
+            if self._fh is None:
+                return ""
+        pos = self._fh.tell()
+        if st.st_size == pos:
+            return ""
+        if st.st_size < pos:
+            # Truncated in place
+            self._fh.seek(0)
+        text = self._decoder.decode(self._fh.read())
+        return clean_terminal_output(text) if text else ""
+
+    def _open(self) -> bool:
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return False
+        self._fd = fd
+        self._kq = select.kqueue()
+        self._kq.control([select.kevent(
+            fd,
+            filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND
+            | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME,
+        )], 0)
+        return True
 
+    def wait(self, timeout: float):
+        if not hasattr(select, "kqueue") or (self._kq is None and not self._open()):
+            time.sleep(timeout)
+            return
+        events = self._kq.control(None, 1, timeout)
+        if any(e.fflags & (select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME) for e in events):
+            # The file was replaced; watch the new one on the next wait
+            self._unwatch()
 
-def capture_from_file(path: str, last_pos: int = 0) -> tuple[str, int]:
-    """Capture new content from a log file, clean terminal noise."""
+    def _unwatch(self):
+        if self._kq is not None:
+            self._kq.close()
+            os.close(self._fd)
+            self._kq = self._fd = None
+
+    def close(self):
+        self._unwatch()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def _tmux_format(pane: str, fmt: str) -> Optional[str]:
+    """Expand a tmux format string for *pane*, or None if tmux fails."""
     try:
-        with open(path, "r", errors="replace") as fh:
-            fh.seek(last_pos)
-            new_text = fh.read()
-            new_pos = fh.tell()
-        return clean_terminal_output(new_text), new_pos
-    except FileNotFoundError:
-        return "", last_pos
+        result = subprocess.run(
+            ["tmux", "display-message", "-p", "-t", pane, fmt],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+class PanePipe:
+    """Stream a tmux pane's output through `tmux pipe-pane` into a FIFO.
+
+    Each read() drains only the bytes written since the last call, so
+    there is no periodic capture-pane spawn and no scroll-back to diff.
+    """
+
+    def __init__(self, pane: str):
+        self.pane = pane
+        # pipe-pane allows one pipe per pane, and attaching replaces it; don't
+        # tear down a pipe someone else set up (e.g. a `cat >> log` one)
+        if _tmux_format(pane, "#{pane_pipe}") == "1":
+            print(
+                f"Error: tmux pane {pane} already has a pipe-pane attached. "
+                f"Close it with `tmux pipe-pane -t {pane}`, or point --logfile "
+                "at the file it writes to.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        safe_pane = re.sub(r"[^\w.-]", "_", pane)
+        self.path = os.path.join(tempfile.gettempdir(), f"narrator-{safe_pane}.fifo")
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        os.mkfifo(self.path)
+        # Open our end first (non-blocking) so the writer's open never blocks
+        self._fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        # True while no writer is attached: the FIFO then polls readable
+        # (EOF) forever, so wait() must not select on it
+        self._eof = False
+        result = subprocess.run(
+            ["tmux", "pipe-pane", "-t", pane, f"cat > {shlex.quote(self.path)}"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if result.returncode != 0:
+            self._release()
+            print(
+                f"Error: tmux pipe-pane failed for pane {pane}: {result.stderr.strip()}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+    def read(self) -> str:
+        """Return cleaned text written to the pane since the last read."""
+        chunks = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                # A writer is attached and has nothing more for now
+                self._eof = False
+                break
+            if not data:
+                # No writer attached (not yet, or the pane closed)
+                self._eof = True
+                break
+            chunks.append(data)
+        # The incremental decoder keeps a split UTF-8 sequence for next time
+        return clean_terminal_output(self._decoder.decode(b"".join(chunks)))
+
+    def wait(self, timeout: float):
+        """Sleep until the pane writes more output, or *timeout* passes."""
+        if self._eof:
+            time.sleep(timeout)
+        else:
+            select.select([self._fd], [], [], timeout)
+
+    def close(self):
+        # Only detach if our `cat` still holds the FIFO open: if the user
+        # replaced the pane's pipe since, the pipe attached now isn't ours
+        if self._has_writer():
+            try:
+                # pipe-pane with no command closes the pane's pipe
+                subprocess.run(
+                    ["tmux", "pipe-pane", "-t", self.pane],
+                    capture_output=True,
+                    timeout=5,
+                )
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                pass
+        self._release()
+
+    def _has_writer(self) -> bool:
+        try:
+            # EOF means every writer has closed its end
+            return os.read(self._fd, 65536) != b""
+        except BlockingIOError:
+            return True
+
+    def _release(self):
+        os.close(self._fd)
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def _rfind_lines(text: str, anchor: str) -> int:
+    """Return the end offset of the last line-aligned *anchor* in *text*, or -1."""
+    end = len(text)
+    while end >= 0:
+        idx = text.rfind(anchor, 0, end)
+        if idx < 0:
+            break
+        stop = idx + len(anchor)
+        if (idx == 0 or text[idx - 1] == "\n") and (
+            stop == len(text) or text[stop] == "\n"
+        ):
+            return stop
+        end = stop - 1
+    return -1
+
+
+# Whitespace-only lines at the end of a capture (the pane's unused rows).
+# Only whole lines: trailing spaces on the last real line (a "$ " prompt)
+# are part of it, and line-aligned anchors must keep them.
+_TRAILING_BLANK_LINES_RE = re.compile(r"(?:\n[ \t]*)+\Z")
 
 
 def get_new_output(current: str, previous: str) -> Optional[str]:
@@ -45,30 +269,42 @@ def get_new_output(current: str, previous: str) -> Optional[str]:
         # First capture -- skip to avoid narrating stale screen content
         return None
 
-    prev_lines = previous.splitlines()
-    cur_lines = current.splitlines()
-
-    if prev_lines == cur_lines:
+    if current == previous:
         return None
 
+    # Only the last few lines of previous are needed as anchors; slice them
+    # off the end instead of splitting the whole capture. Trailing blank
+    # lines (the unused bottom of a tmux pane) are dropped, or the anchor
+    # would be padding that also ends every later capture.
+    prev_body = _TRAILING_BLANK_LINES_RE.sub("", previous)
+    cur_body = _TRAILING_BLANK_LINES_RE.sub("", current)
+    prev_tail = prev_body.rsplit("\n", 5)[-5:]
+
     # Try multiple anchor sizes to find where previous content ends in current
     for anchor_size in [5, 3, 2, 1]:
-        if len(prev_lines) < anchor_size:
+        if len(prev_tail) < anchor_size:
             continue
-        # Use the last N non-blank lines of previous as anchor
-        anchor = prev_lines[-anchor_size:]
-
-        # Search for the anchor in current (prefer latest match)
-        for i in range(len(cur_lines) - anchor_size, -1, -1):
-            if cur_lines[i : i + anchor_size] == anchor:
-                new_lines = cur_lines[i + anchor_size :]
-                new_text = "\n".join(new_lines).strip()
-                return new_text if new_text else None
-
-    # Fallback: if content changed but we can't anchor, return the
-    # trailing portion that differs
-    if len(cur_lines) > len(prev_lines):
-        new_lines = cur_lines[len(prev_lines) :]
+        # Use the last N lines of previous as anchor, searched as one
+        # substring (prefer latest match)
+        anchor = "\n".join(prev_tail[-anchor_size:])
+        stop = _rfind_lines(cur_body, anchor)
+        if stop >= 0:
+            new_text = cur_body[stop:].strip()
+            return new_text if new_text else None
+
+    # Padding is excluded here too: a long run of blank lines would otherwise
+    # win find_longest_match and hide the real anchor
+    prev_lines = prev_body.splitlines()
+    cur_lines = cur_body.splitlines()
+
+    # Fallback: the exact anchor is gone (e.g. the last line was redrawn or
+    # scrolled out). Find the longest run of recent previous lines that
+    # survives in current and take what follows it.
+    tail = prev_lines[-50:]
+    matcher = difflib.SequenceMatcher(None, tail, cur_lines, autojunk=False)
+    match = matcher.find_longest_match(0, len(tail), 0, len(cur_lines))
+    if match.size:
+        new_lines = cur_lines[match.b + match.size :]
         new_text = "\n".join(new_lines).strip()
         return new_text if new_text else None
 
@@ -2,28 +2,48 @@
 
 import re
 
-_ANSI_RE = re.compile(r"""
+_ANSI_PATTERN = r"""
     \x1b       # ESC
     (?:
         \[     # CSI sequences (colors, cursor, etc.)
         [0-9;?]*
         [A-Za-z]
     |
-        \]     # OSC sequences
-        .*?
+        \]     # OSC sequences -- body stops at BEL/ESC/newline so an
+        [^\x07\x1b\n]*   # unterminated OSC can't rescan the line (linear time)
         (?:\x07|\x1b\\)
     |
         [()][AB012]   # charset switching
     |
         [=><=]        # keypad / cursor modes
     )
-""", re.VERBOSE)
+"""
 
+# ANSI escapes + bare control characters in one alternation (single pass).
+# The ANSI branch is tried first; a stray ESC falls through to the char class.
+# Both branches start with a known character set, so the regex engine skips
+# plain runs in C; a Python-level str.find("\x1b") loop is slower than this
+# on both sparse and escape-dense output.
+_STRIP_RE = re.compile(
+    _ANSI_PATTERN + r"| [\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", re.VERBOSE
+)
+_SUB = _STRIP_RE.sub
+
+# Control characters alone, for text that contains no ESC
 _CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
 
+# Bytes variants for raw subprocess output (the patterns are ASCII-only).
+# Control bytes never occur inside UTF-8 multibyte sequences, so they can be
+# deleted with bytes.translate before decoding.
+_ANSI_BYTES_RE = re.compile(_ANSI_PATTERN.encode("ascii"), re.VERBOSE)
+_CONTROL_BYTES = bytes(range(0x00, 0x09)) + b"\x0b\x0c" + bytes(range(0x0e, 0x20)) + b"\x7f"
+
 # High-byte Unicode box-drawing / decorative characters from Claude Code UI
 _UNICODE_NOISE_RE = re.compile(r"[\u2500-\u257f\u2580-\u259f\u25a0-\u25ff\u2800-\u28ff\ue000-\uf8ff\U000f0000-\U000fffff]+")
 
+# Runs of spaces left behind by stripped noise
+_MULTISPACE_RE = re.compile(r"  +")
+
 # Lines that are just UI noise from Claude Code
 _NOISE_PATTERNS = [
     re.compile(r"^\s*[─━┄┈╌═╍]+\s*$"),           # horizontal rules
@@ -44,17 +64,41 @@ _NOISE_PATTERNS = [
     re.compile(r"^\s*$"),                          # blank lines
 ]
 
+# All of the above fused into one alternation, so each line costs a single
+# regex call. Every pattern is ^-anchored, so match() is enough.
+_NOISE_MATCH = re.compile("|".join(f"(?:{p.pattern})" for p in _NOISE_PATTERNS)).match
 
-def strip_ansi(text: str) -> str:
-    """Remove ANSI escape sequences, control characters, and Unicode noise."""
-    text = _ANSI_RE.sub("", text)
-    text = _CONTROL_RE.sub("", text)
-    text = _UNICODE_NOISE_RE.sub(" ", text)
+
+def _strip_unicode_noise(text: str) -> str:
+    # isascii() is O(1) on CPython; every noise character is non-ASCII
+    if not text.isascii():
+        text = _UNICODE_NOISE_RE.sub(" ", text)
     # Collapse multiple spaces
-    text = re.sub(r"  +", " ", text)
+    if "  " in text:
+        text = _MULTISPACE_RE.sub(" ", text)
     return text
 
 
+def strip_ansi(text: str) -> str:
+    """Remove ANSI escape sequences, control characters, and Unicode noise."""
+    # Most captures have no escapes at all; only pay for the full pattern
+    # when an ESC is present, and for the control-char pass when one matches.
+    if "\x1b" in text:
+        text = _SUB("", text)
+    elif _CONTROL_RE.search(text):
+        text = _CONTROL_RE.sub("", text)
+    return _strip_unicode_noise(text)
+
+
+def strip_ansi_bytes(data: bytes) -> str:
+    """Like strip_ansi, but strips raw bytes and decodes only what survives."""
+    # `in` on bytes is a memchr scan; plain `capture-pane -p` output has no ESC
+    if b"\x1b" in data:
+        data = _ANSI_BYTES_RE.sub(b"", data)
+    data = data.translate(None, _CONTROL_BYTES)
+    return _strip_unicode_noise(data.decode("utf-8", "replace"))
+
+
 def clean_terminal_output(text: str) -> str:
     """Strip ANSI codes and filter out Claude Code UI noise lines."""
     text = strip_ansi(text)
@@ -63,7 +107,7 @@ def clean_terminal_output(text: str) -> str:
         line = line.strip()
         if not line:
             continue
-        if any(p.search(line) for p in _NOISE_PATTERNS):
+        if _NOISE_MATCH(line):
             continue
         clean_lines.append(line)
     return "\n".join(clean_lines)
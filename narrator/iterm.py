@@ -1,16 +1,82 @@
 """AppleScript helpers for sending text to iTerm2 tabs."""
 
+import hashlib
+import os
 import re
 import subprocess
 import sys
+import tempfile
+from typing import Optional
 
+# Text and optional session id arrive as argv, so nothing is interpolated
+# into the script source and it can be compiled once
+_SEND_SCRIPT = """
+on run argv
+    set msg to item 1 of argv
+    tell application "iTerm2"
+        if (count of argv) > 1 then
+            tell session id (item 2 of argv)
+                write text msg
+            end tell
+        else
+            tell current window
+                tell first tab
+                    tell current session
+                        write text msg
+                    end tell
+                end tell
+            end tell
+        end if
+    end tell
+end run
+"""
 
-def _escape_for_applescript(s: str) -> str:
-    """Escape a string for safe interpolation into an AppleScript string literal."""
-    s = s.replace("\\", "\\\\").replace('"', '\\"')
-    # Strip control characters (newlines, tabs, etc.) that could break the literal
-    s = re.sub(r"[\x00-\x1f\x7f]", " ", s)
-    return s
+# Named by content, so every run reuses the same compiled file and a changed
+# script gets a new one
+_COMPILED_SCRIPT = os.path.join(
+    tempfile.gettempdir(),
+    f"narrator_send_{hashlib.sha256(_SEND_SCRIPT.encode()).hexdigest()[:12]}.scpt",
+)
+_compiled: Optional[bool] = None
+
+_CONTROL_RE = re.compile(r"[\x00-\x1f\x7f]")
+
+
+def _script_args() -> list[str]:
+    """Return the osascript arguments that run the send script.
+
+    Compiles it with osacompile on first use so later calls skip parsing
+    and compiling; falls back to passing the source with -e.
+    """
+    global _compiled
+    if _compiled is None and os.path.exists(_COMPILED_SCRIPT):
+        _compiled = True
+    if _compiled is None:
+        # Compile beside the final path and rename, so a concurrent run never
+        # executes a half-written file
+        # (keeping the .scpt extension osacompile picks the format from)
+        tmp_path = _COMPILED_SCRIPT.replace(".scpt", f"-{os.getpid()}.scpt")
+        try:
+            result = subprocess.run(
+                ["osacompile", "-o", tmp_path, "-e", _SEND_SCRIPT],
+                capture_output=True,
+                timeout=10,
+            )
+            _compiled = result.returncode == 0
+            if _compiled:
+                os.replace(tmp_path, _COMPILED_SCRIPT)
+        except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+            _compiled = False
+        finally:
+            # Left behind only when compiling or the rename failed
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    if _compiled:
+        return [_COMPILED_SCRIPT]
+    # "--" ends option parsing, so text starting with "-" reaches argv
+    return ["-e", _SEND_SCRIPT, "--"]
 
 
 def send_to_claude_tab(text: str, session_id: str = None):
@@ -24,36 +90,22 @@ def send_to_claude_tab(text: str, session_id: str = None):
         print("Warning: iTerm2 integration only works on macOS.", file=sys.stderr)
         return
 
-    escaped = _escape_for_applescript(text)
+    # Strip control characters (newlines, tabs, etc.) so the text is typed
+    # as a single line
+    if not text.isprintable():
+        text = _CONTROL_RE.sub(" ", text)
 
+    argv = [text]
     if session_id:
         # Validate session_id: only allow alphanumeric, hyphens, and underscores
         if not re.match(r"^[\w-]+$", session_id, re.ASCII):
             print(f"Warning: invalid session_id '{session_id}'.", file=sys.stderr)
             return
-        script = f'''
-tell application "iTerm2"
-    tell session id "{session_id}"
-        write text "{escaped}"
-    end tell
-end tell
-'''
-    else:
-        script = f'''
-tell application "iTerm2"
-    tell current window
-        tell first tab
-            tell current session
-                write text "{escaped}"
-            end tell
-        end tell
-    end tell
-end tell
-'''
+        argv.append(session_id)
 
     try:
         subprocess.run(
-            ["osascript", "-e", script],
+            ["osascript", *_script_args(), *argv],
             capture_output=True,
             timeout=5,
         )
@@ -1,10 +1,17 @@
 """Ollama LLM filter for terminal output."""
 
+import hashlib
+import json
 import re
 import sys
+import time
+from collections import OrderedDict, deque
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+from urllib3.util.retry import Retry
 
 SYSTEM_PROMPT = """\
 You are a terminal watcher for Claude Code. You receive raw terminal output and must detect when Claude is asking the user to take action.
@@ -46,7 +53,297 @@ If the output is ONLY code, diffs, file contents, or terminal noise, respond wit
 
 Output ONLY the prefixed text to be spoken, or SKIP. Nothing else."""
 
+# One keep-alive connection pool for every Ollama request, so each poll
+# reuses the open socket instead of reconnecting.
+# Connect failures (server still starting) are retried inside urllib3.
+# Read errors are not, so a slow generation is never sent twice; a reused
+# keep-alive socket the server already closed is retried once by _post.
+_RETRY = Retry(total=2, connect=2, read=False, status=0, backoff_factor=0.2)
+_SESSION = requests.Session()
+_SESSION.mount(
+    "http://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=2, pool_block=True, max_retries=_RETRY),
+)
+
+
+def get_session() -> requests.Session:
+    """Return the shared HTTP session used for Ollama requests."""
+    return _SESSION
+
+
+def _post(url: str, payload: dict, timeout: float, stream: bool = False) -> requests.Response:
+    """POST on the shared session, retrying once if a pooled socket was dead.
+
+    A keep-alive connection the server closed while idle fails with a
+    protocol error before any response arrives, so the request never ran
+    and is safe to send again on a fresh connection.
+    """
+    try:
+        return _SESSION.post(url, json=payload, stream=stream, timeout=timeout)
+    except requests.exceptions.ConnectionError as exc:
+        if not (exc.args and isinstance(exc.args[0], ProtocolError)):
+            raise
+    return _SESSION.post(url, json=payload, stream=stream, timeout=timeout)
+
+
+# Leads every user message; warm_up sends it alone so the cached prefix
+# always matches what filter_with_llm sends after it
+_USER_PREFIX = "Terminal output:\n"
+
+# Shared by every chat request. num_ctx must not vary between calls or
+# Ollama reloads the model.
+_KEEP_ALIVE = "30m"
+_CHAT_OPTIONS = {
+    "temperature": 0.3,
+    # Narrow sampling: the answer is SKIP or one short line
+    "top_k": 20,
+    "top_p": 0.8,
+    "repeat_penalty": 1.0,
+    "num_ctx": 2048,
+    "num_predict": 128,
+    "stop": ["\n\n"],
+}
+
+# Longer inputs are cut to their tail; longer narrations are cut at a word
+_MAX_INPUT_CHARS = 3000
+_MAX_NARRATION_CHARS = 500
+
+_SKIP_RE = re.compile(r"SKIP\b", re.IGNORECASE)
 _PREFIX_RE = re.compile(r"^\[([QS])\]\s*", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+")
+
+# Cheap pre-filter signatures for text the LLM would always SKIP
+_PROMPT_ONLY_RE = re.compile(r"^[\s$>#%]*$")
+_DIFF_LINE_RE = re.compile(r"^(?:diff --git |index [0-9a-f]{7,}\.\.|@@ |\+\+\+ |--- |[+-](?! ))")
+# Short text is only worth an LLM call if it looks like a question, a
+# prompt for action, or a status summary (the things SYSTEM_PROMPT speaks),
+# or reads as prose (several sentences)
+_LLM_TRIGGER_MAX_CHARS = 400
+_LLM_TRIGGER_MIN_SENTENCES = 3
+_LLM_TRIGGER_RE = re.compile(
+    r"\?|\b(?:yes/no|y/n|approve|allow|deny|waiting|failed|would you|"
+    r"do you want|wants to|needs|input|permission|choose|select|which|option \d|"
+    r"confirm|continue|proceed|ready|done|finished|complete[d]?|created|updated|"
+    r"fixed|added|refactored|implemented|committed|pushed|passed|tests?)\b"
+    # ValueError, ConnectionError, RuntimeException, tracebacks
+    r"|\w*(?:error|exception)s?\b|traceback"
+    # A numbered option list, with or without a closing question
+    r"|^\s*[1-9][.)]\s",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SENTENCE_END_RE = re.compile(r"[.!?](?:\s|$)")
+# An explicit prompt is always worth an LLM call, even when it trails a diff
+# or a wall of symbols (e.g. "Do you want to make this edit?" after a hunk)
+_PROMPT_ACCEPT_RE = re.compile(
+    r"\b(?:y/n|yes/no|allow|deny|do you want)\b|\w*error\b|traceback|exception|\?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Response cache: hash of model + normalized text -> (stored_at, result). Repeated
+# captures (redrawn banners, spinner frames) skip the LLM entirely.
+# SKIP outcomes are cached as None; request errors are never cached.
+_CACHE_MAX = 512
+_CACHE_TTL = 600.0
+_cache: "OrderedDict[str, tuple[float, Optional[tuple[str, bool]]]]" = OrderedDict()
+
+
+def _cache_key(text: str, model: str) -> str:
+    normalized = _WHITESPACE_RE.sub(" ", text.strip().lower())
+    return hashlib.sha1(f"{model}\0{normalized}".encode()).hexdigest()
+
+
+def _remember(key: Optional[str], result: Optional[tuple[str, bool]]):
+    if key is not None:
+        _cache[key] = (time.monotonic(), result)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_MAX:
+            _cache.popitem(last=False)
+    return result
+
+
+# Near-duplicate tier below the exact cache: word 3-shingle sets of the last
+# few inputs that were actually narrated. A capture that only differs by a
+# spinner frame or a redrawn line still scores above the threshold. Entries
+# expire after a short window: a repaint lands within seconds, while the same
+# text minutes later is a new event.
+_RECENT_NARRATED_MAX = 8
+_NEAR_DUP_THRESHOLD = 0.85
+_NEAR_DUP_WINDOW = 30.0
+# (time narrated, shingles)
+_recent_narrated: "deque[tuple[float, frozenset[int]]]" = deque(maxlen=_RECENT_NARRATED_MAX)
+
+
+def _shingles(text: str) -> frozenset[int]:
+    # Word tokens only, so spinner glyphs and punctuation don't count
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < 3:
+        return frozenset([hash(tuple(words))])
+    return frozenset(hash(tuple(words[i:i + 3])) for i in range(len(words) - 2))
+
+
+def is_near_duplicate(text: str) -> bool:
+    """Return True if *text* closely matches a recently narrated input.
+
+    Explicit prompts are never treated as duplicates: the same approval
+    request asked twice must be heard twice.
+    """
+    if _PROMPT_ACCEPT_RE.search(text):
+        return False
+    cutoff = time.monotonic() - _NEAR_DUP_WINDOW
+    while _recent_narrated and _recent_narrated[0][0] < cutoff:
+        _recent_narrated.popleft()
+    shingles = _shingles(text)
+    for _, seen in _recent_narrated:
+        union = len(shingles | seen)
+        if union and len(shingles & seen) / union >= _NEAR_DUP_THRESHOLD:
+            return True
+    return False
+
+
+def remember_narrated(text: str):
+    """Record *text* as an input that produced a narration."""
+    _recent_narrated.append((time.monotonic(), _shingles(text)))
+
+
+def _compact_lines(text: str) -> str:
+    """Drop blank lines and lines that repeat the line before them."""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and (not lines or line != lines[-1]):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _chat_request(
+    user_content: str,
+    model: str,
+    ollama_url: str,
+    llama_server_url: Optional[str],
+    stream: bool,
+    num_predict: Optional[int] = None,
+) -> tuple[str, dict]:
+    """Return (url, payload) for a chat request to Ollama or a llama.cpp server.
+
+    Both get the same messages and sampling settings. llama.cpp's
+    OpenAI-compatible endpoint serves whichever model it was started with
+    and needs cache_prompt to keep the system-prompt prefix in its KV cache.
+    """
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_content},
+    ]
+    options = _CHAT_OPTIONS
+    if num_predict is not None:
+        options = {**options, "num_predict": num_predict}
+    if llama_server_url:
+        return f"{llama_server_url}/v1/chat/completions", {
+            "messages": messages,
+            "stream": stream,
+            "cache_prompt": True,
+            "max_tokens": options["num_predict"],
+            "temperature": options["temperature"],
+            "top_k": options["top_k"],
+            "top_p": options["top_p"],
+            "repeat_penalty": options["repeat_penalty"],
+            "stop": options["stop"],
+        }
+    return f"{ollama_url}/api/chat", {
+        "model": model,
+        "messages": messages,
+        "stream": stream,
+        "keep_alive": _KEEP_ALIVE,
+        "options": options,
+    }
+
+
+def _iter_content(resp: requests.Response, llama_server: bool):
+    """Yield (content, done) for each streamed chunk of a chat response."""
+    for line in resp.iter_lines():
+        if not line:
+            continue
+        if llama_server:
+            # Server-sent events: "data: {...}", ending with "data: [DONE]"
+            if not line.startswith(b"data: "):
+                continue
+            data = line[len(b"data: "):]
+            if data == b"[DONE]":
+                return
+            chunk = json.loads(data)
+            if "error" in chunk:
+                raise RuntimeError(f"server error: {chunk['error']}")
+            choice = chunk["choices"][0]
+            yield choice.get("delta", {}).get("content") or "", choice.get("finish_reason") is not None
+        else:
+            chunk = json.loads(line)
+            # A missing model or OOM arrives as {"error": ...}; raising keeps
+            # it from being read as an empty reply and cached as SKIP
+            if "error" in chunk:
+                raise RuntimeError(f"Ollama error: {chunk['error']}")
+            yield chunk.get("message", {}).get("content", ""), chunk.get("done", False)
+
+
+def warm_up(
+    model: str = "qwen2.5:14b",
+    ollama_url: str = "http://localhost:11434",
+    timeout: float = 120.0,
+    llama_server_url: Optional[str] = None,
+):
+    """Load *model* and prefill SYSTEM_PROMPT so the first real filter call is fast.
+
+    Sends a one-token chat request with the same system message and options
+    as filter_with_llm, leaving the model resident with the prompt prefix in
+    the server's KV cache. Failures are ignored; filtering works without it.
+    """
+    url, payload = _chat_request(
+        _USER_PREFIX, model, ollama_url, llama_server_url,
+        stream=False, num_predict=1,
+    )
+    try:
+        resp = _post(url, payload, timeout)
+        resp.raise_for_status()
+    except requests.exceptions.RequestException:
+        pass
+
+
+def should_skip_fast(text: str) -> bool:
+    """Return True if *text* is obviously not worth narrating.
+
+    Catches the common cases (bare shell prompts, diff hunks, symbol soup,
+    short output with no question, prompt or summary wording) in
+    microseconds so they never reach the LLM. Explicit prompts (y/n, allow,
+    a trailing question mark) are always let through.
+    """
+    # Before the length checks: "Continue? [Y/n]" is short but must be heard
+    if _PROMPT_ACCEPT_RE.search(text):
+        return False
+
+    letters = sum(c.isalpha() for c in text)
+    if letters < 15:
+        return True
+
+    if (
+        len(text) < _LLM_TRIGGER_MAX_CHARS
+        and not _LLM_TRIGGER_RE.search(text)
+        and len(_SENTENCE_END_RE.findall(text)) < _LLM_TRIGGER_MIN_SENTENCES
+    ):
+        return True
+
+    # Spinners, progress bars and box drawing: mostly non-letters
+    if letters < 0.3 * len(text):
+        return True
+
+    symbols = sum(not c.isalnum() and not c.isspace() for c in text)
+    if symbols > letters:
+        return True
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    noisy = sum(
+        1 for line in lines
+        if _PROMPT_ONLY_RE.match(line) or _DIFF_LINE_RE.match(line)
+    )
+    return noisy >= 0.7 * len(lines)
 
 
 def filter_with_llm(
@@ -54,37 +351,59 @@ def filter_with_llm(
     model: str = "qwen2.5:14b",
     ollama_url: str = "http://localhost:11434",
     timeout: float = 30.0,
+    use_cache: bool = True,
+    llama_server_url: Optional[str] = None,
 ) -> Optional[tuple[str, bool]]:
     """Send captured text to Ollama for intelligent filtering.
 
     Returns (narration_text, is_question) or None if it should be skipped.
+    Results for previously seen text are served from a local cache unless
+    *use_cache* is False. If *llama_server_url* is set, a llama.cpp server
+    is queried instead of Ollama.
     """
-    # Truncate very long inputs to avoid slow inference
-    max_input_chars = 3000
-    if len(text) > max_input_chars:
-        text = text[:max_input_chars] + "\n... (truncated)"
+    key = None
+    if use_cache:
+        key = _cache_key(text, model)
+        hit = _cache.get(key)
+        if hit is not None:
+            stored_at, cached = hit
+            if time.monotonic() - stored_at < _CACHE_TTL:
+                _cache.move_to_end(key)
+                return cached
+            del _cache[key]
 
-    prompt = f"{SYSTEM_PROMPT}\n\nTerminal output:\n{text}"
+    # Every character is prefill work: drop repeated lines (redrawn status
+    # lines, spinner frames), then truncate very long inputs. Keep the end,
+    # where a question or summary shows up, not the start.
+    text = _compact_lines(text)
+    if len(text) > _MAX_INPUT_CHARS:
+        text = "(truncated) ...\n" + text[-_MAX_INPUT_CHARS:]
 
     try:
-        resp = requests.post(
-            f"{ollama_url}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.3,
-                    "num_predict": 256,
-                },
-            },
-            timeout=timeout,
+        # The system prompt goes in its own message and never contains dynamic
+        # text, so the server can reuse its KV prefix cache across calls.
+        # Stream tokens so we can hang up as soon as the answer is decided;
+        # closing the connection also stops generation on the server side.
+        url, payload = _chat_request(
+            _USER_PREFIX + text, model, ollama_url, llama_server_url,
+            stream=True,
         )
-        resp.raise_for_status()
-        result = resp.json().get("response", "").strip()
+        result = ""
+        with _post(url, payload, timeout, stream=True) as resp:
+            resp.raise_for_status()
+            for content, done in _iter_content(resp, bool(llama_server_url)):
+                result += content
+                head = result.lstrip()
+                # Hang up only once the character after SKIP has arrived:
+                # "Skipped 3 tests" is a narration
+                if (len(head) > 4 and _SKIP_RE.match(head)) or len(head) > _MAX_NARRATION_CHARS:
+                    break
+                if done:
+                    break
+        result = result.strip()
 
-        if not result or result.upper() == "SKIP":
-            return None
+        if not result or _SKIP_RE.match(result):
+            return _remember(key, None)
 
         # Parse [Q] / [S] prefix
         is_question = False
@@ -94,21 +413,23 @@ def filter_with_llm(
             result = result[m.end():]
 
         # Truncate overly long narrations
-        max_narration = 500
-        if len(result) > max_narration:
-            result = result[:max_narration].rsplit(" ", 1)[0] + "..."
+        if len(result) > _MAX_NARRATION_CHARS:
+            result = result[:_MAX_NARRATION_CHARS].rsplit(" ", 1)[0] + "..."
 
-        return (result, is_question)
+        return _remember(key, (result, is_question))
 
     except requests.exceptions.ConnectionError:
-        print(
-            "Warning: Cannot reach Ollama. Is it running? (ollama serve)",
-            file=sys.stderr,
-        )
+        if llama_server_url:
+            print("Warning: Cannot reach the llama.cpp server.", file=sys.stderr)
+        else:
+            print(
+                "Warning: Cannot reach Ollama. Is it running? (ollama serve)",
+                file=sys.stderr,
+            )
         return None
     except requests.exceptions.Timeout:
-        print("Warning: Ollama request timed out.", file=sys.stderr)
+        print("Warning: LLM request timed out.", file=sys.stderr)
         return None
     except Exception as exc:
-        print(f"Warning: Ollama error: {exc}", file=sys.stderr)
+        print(f"Warning: LLM error: {exc}", file=sys.stderr)
         return None
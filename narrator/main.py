@@ -2,16 +2,25 @@
 
 import argparse
 import os
+import select
 import sys
 import threading
 import time
-
-import requests
-
-from narrator.capture import capture_from_file, capture_pane, get_new_output
-from narrator.llm import filter_with_llm
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional
+
+from narrator.capture import (
+    LogWatcher,
+    PanePipe,
+    capture_pane_raw,
+    get_new_output,
+)
+from narrator.clean import strip_ansi_bytes
 from narrator.tts import NarrationQueue
 
+# Flush buffered output to the LLM early once it grows past this size
+_MAX_BATCH_CHARS = 2500
+
 
 class CommandListener:
     """Listens for typed commands (pause/resume/stop/voice) in a background thread."""
@@ -21,20 +30,51 @@ class CommandListener:
         self._voice_trigger = voice_trigger
         self._stop = threading.Event()
         self.shutdown_requested = threading.Event()
+        # Bytes read from stdin that don't complete a line yet
+        self._pending = b""
         self._thread = threading.Thread(target=self._listener, daemon=True)
         self._thread.start()
 
-    def _listener(self):
-        while not self._stop.is_set():
+    def _read_command(self) -> Optional[str]:
+        """Return the next typed line, "" if none yet, or None on EOF.
+
+        Polls stdin with a timeout so stop() takes effect within half a
+        second instead of leaving the thread parked in input() forever.
+        Reads the fd directly: lines left in sys.stdin's buffer would be
+        invisible to select() until more input arrived.
+        """
+        if sys.platform == "win32":
+            # select() only takes sockets on Windows
             try:
-                cmd = input().strip().lower()
+                return input()
             except EOFError:
+                return None
+        if b"\n" not in self._pending:
+            ready, _, _ = select.select([sys.stdin], [], [], 0.5)
+            if not ready:
+                return ""
+            data = os.read(sys.stdin.fileno(), 4096)
+            if not data:
+                # EOF: hand over an unterminated last line first
+                line, self._pending = self._pending, b""
+                return line.decode(errors="replace") if line else None
+            self._pending += data
+            if b"\n" not in self._pending:
+                return ""
+        line, _, self._pending = self._pending.partition(b"\n")
+        return line.decode(errors="replace")
+
+    def _listener(self):
+        while not self._stop.is_set():
+            cmd = self._read_command()
+            if cmd is None:
                 break
+            cmd = cmd.strip().lower()
             if cmd in ("pause", "p"):
-                self.queue.paused.set()
+                self.queue.pause()
                 print("  Narrator paused. Type 'resume' to continue.")
             elif cmd in ("resume", "r"):
-                self.queue.paused.clear()
+                self.queue.resume()
                 print("  Narrator resumed.")
             elif cmd in ("stop", "quit", "q"):
                 print("  Shutting down...")
@@ -80,6 +120,10 @@ Examples:
         "--interval", type=float, default=3.0,
         help="Seconds between captures (default: 3.0)",
     )
+    parser.add_argument(
+        "--quiet-window", type=float, default=1.5,
+        help="Seconds without new output before sending buffered text to the LLM (default: 1.5)",
+    )
     parser.add_argument(
         "--voice", default="Samantha",
         help="TTS voice name (default: Samantha)",
@@ -88,6 +132,11 @@ Examples:
         "--model", default="qwen2.5:14b",
         help="Ollama model for filtering (default: qwen2.5:14b)",
     )
+    parser.add_argument(
+        "--fast-model", default=None,
+        help="Smaller Ollama model that screens output first; only text it "
+             "doesn't SKIP goes to --model (e.g. qwen2.5:3b; default: off)",
+    )
     parser.add_argument(
         "--tts", default="piper", choices=["say", "piper"],
         help="TTS engine (default: piper)",
@@ -96,10 +145,19 @@ Examples:
         "--ollama-url", default="http://localhost:11434",
         help="Ollama API base URL (default: http://localhost:11434)",
     )
+    parser.add_argument(
+        "--llama-server-url", default=None,
+        help="Query a llama.cpp server (e.g. http://localhost:8080) instead of Ollama; "
+             "--model is ignored, the server uses the model it was started with",
+    )
     parser.add_argument(
         "--logfile", default=None,
         help="Watch a log file instead of a tmux pane (fallback mode)",
     )
+    parser.add_argument(
+        "--pipe-pane", action="store_true",
+        help="Stream the tmux pane via `tmux pipe-pane` instead of polling capture-pane",
+    )
     parser.add_argument(
         "--max-queue", type=int, default=3,
         help="Max pending narrations before dropping stale ones (default: 3)",
@@ -108,6 +166,10 @@ Examples:
         "--dry-run", action="store_true",
         help="Print narrations to stdout without speaking them",
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Always query the LLM, even for text it has already classified or recently narrated",
+    )
 
     # Voice input flags
     parser.add_argument(
@@ -142,31 +204,65 @@ Examples:
     )
 
     args = parser.parse_args()
+    if args.fast_model and args.llama_server_url:
+        # llama-server serves the one model it was started with, so both
+        # stages of the cascade would hit the same model
+        parser.error("--fast-model has no effect with --llama-server-url")
+
+    # Deferred so --help and argument errors don't pay for loading requests
+    import requests
+
+    from narrator.llm import (
+        filter_with_llm,
+        get_session,
+        is_near_duplicate,
+        remember_narrated,
+        should_skip_fast,
+        warm_up,
+    )
 
-    # Verify Ollama is reachable
+    # Verify the LLM server is reachable
     try:
-        r = requests.get(f"{args.ollama_url}/api/tags", timeout=5)
-        r.raise_for_status()
-        models = [m["name"] for m in r.json().get("models", [])]
-        if args.model not in models and f"{args.model}:latest" not in models:
-            # Check partial match
-            found = any(args.model.split(":")[0] in m for m in models)
-            if not found:
-                print(
-                    f"Warning: Model '{args.model}' not found in Ollama. "
-                    f"Available: {', '.join(models) or 'none'}",
-                    file=sys.stderr,
-                )
-                print(f"Run: ollama pull {args.model}", file=sys.stderr)
+        if args.llama_server_url:
+            get_session().get(f"{args.llama_server_url}/health", timeout=5)
+        else:
+            r = get_session().get(f"{args.ollama_url}/api/tags", timeout=5)
+            r.raise_for_status()
+            models = [m["name"] for m in r.json().get("models", [])]
+            for wanted in filter(None, (args.model, args.fast_model)):
+                if wanted in models or f"{wanted}:latest" in models:
+                    continue
+                # Check partial match
+                found = any(wanted.split(":")[0] in m for m in models)
+                if not found:
+                    print(
+                        f"Warning: Model '{wanted}' not found in Ollama. "
+                        f"Available: {', '.join(models) or 'none'}",
+                        file=sys.stderr,
+                    )
+                    print(f"Run: ollama pull {wanted}", file=sys.stderr)
     except requests.exceptions.ConnectionError:
-        print(
-            "Error: Cannot connect to Ollama. Start it with: ollama serve",
-            file=sys.stderr,
-        )
+        if args.llama_server_url:
+            print(
+                f"Error: Cannot connect to the llama.cpp server at {args.llama_server_url}",
+                file=sys.stderr,
+            )
+        else:
+            print(
+                "Error: Cannot connect to Ollama. Start it with: ollama serve",
+                file=sys.stderr,
+            )
         sys.exit(1)
     except Exception:
         pass  # Non-fatal; we'll retry on each request
 
+    # Load the model(s) and prefill the system prompt while the user gets ready
+    def _warm_models():
+        for name in filter(None, (args.fast_model, args.model)):
+            warm_up(name, args.ollama_url, llama_server_url=args.llama_server_url)
+
+    threading.Thread(target=_warm_models, daemon=True).start()
+
     # ------------------------------------------------------------------
     # Voice input setup
     # ------------------------------------------------------------------
@@ -255,6 +351,7 @@ Examples:
             wake_phrase=args.wake_phrase,
             on_wake=voice_trigger,
             on_speech_interrupt=narration_queue.interrupt,
+            tts_active=narration_queue.speaking,
         )
         wakeword_listener.start()
         print(f"    Wake word: '{args.wake_phrase}' active")
@@ -289,8 +386,13 @@ Examples:
         features.append(f"wake-word({args.wake_phrase})")
     features_str = f" | Features: {', '.join(features)}" if features else ""
 
+    # Load Whisper and the VAD while the user gets ready, not on the first question
+    if voice_input is not None:
+        threading.Thread(target=voice_input.warm_up, daemon=True).start()
+
     print(f"🎙️  Narrator ready — watching {source_desc}")
-    print(f"    Model: {args.model} | Voice: {args.voice} ({args.tts}) | Interval: {args.interval}s{features_str}")
+    model_str = f"{args.fast_model} -> {args.model}" if args.fast_model else args.model
+    print(f"    Model: {model_str} | Voice: {args.voice} ({args.tts}) | Interval: {args.interval}s{features_str}")
     input("\n    Press Enter when you're ready to start narrating...\n")
 
     cmds = "'pause', 'resume', 'stop'"
@@ -301,63 +403,133 @@ Examples:
     # Start command listener for pause/resume/stop/voice
     cmd_listener = CommandListener(narration_queue, voice_trigger=voice_trigger)
 
-    # Set logfile position to end of file so we skip everything before now
-    logfile_pos = 0
-    if use_logfile:
-        try:
-            logfile_pos = os.path.getsize(args.logfile)
-        except OSError:
-            pass
+    pane_pipe = None
+    if not use_logfile and args.pipe_pane:
+        pane_pipe = PanePipe(args.pane)
+
+    # Tails the log file from its current end so we skip everything before now
+    log_watcher = LogWatcher(args.logfile) if use_logfile else None
 
     previous_output = ""
-    previous_hash = ""
+    previous_raw = b""
+
+    # Text captured since the last LLM call; flushed once output goes quiet
+    pending: list[str] = []
+    pending_chars = 0
+    last_activity = 0.0
+    batches = fast_skips = 0
+
+    # The LLM call runs on a worker so capture keeps going while Ollama
+    # generates; output that arrives meanwhile is batched into the next call.
+    llm_pool = ThreadPoolExecutor(max_workers=1)
+    in_flight: Optional[Future] = None
+    in_flight_text = ""
+
+    def _classify(text):
+        use_cache = not args.no_cache
+        if args.fast_model:
+            # Cascade: the small model screens, the main model narrates
+            if filter_with_llm(
+                text, model=args.fast_model, ollama_url=args.ollama_url,
+                use_cache=use_cache, llama_server_url=args.llama_server_url,
+            ) is None:
+                return None
+        return filter_with_llm(
+            text, model=args.model, ollama_url=args.ollama_url,
+            use_cache=use_cache, llama_server_url=args.llama_server_url,
+        )
+
+    def _announce(result):
+        if result:
+            narration, is_question = result
+            tag = "[Q]" if is_question else "[S]"
+            print(f"🔊 {tag} {narration}")
+            if not args.dry_run:
+                narration_queue.enqueue(narration, is_question=is_question)
+        elif args.dry_run:
+            print("  [LLM returned SKIP]")
 
     try:
         while not cmd_listener.shutdown_requested.is_set():
             # --- Capture ---
             if use_logfile:
-                new_text, logfile_pos = capture_from_file(args.logfile, logfile_pos)
-                new_text = new_text.strip() if new_text else None
+                new_text = log_watcher.read().strip() or None
                 if args.dry_run and new_text:
                     print(f"  [logfile: captured {len(new_text)} chars]")
-            else:
-                current_output = capture_pane(args.pane)
-                # Quick check: skip if pane content hasn't changed at all
-                current_hash = str(hash(current_output))
-                if current_hash == previous_hash:
-                    time.sleep(args.interval)
-                    continue
-                previous_hash = current_hash
-                new_text = get_new_output(current_output, previous_output)
-                previous_output = current_output
+            elif pane_pipe:
+                new_text = pane_pipe.read().strip() or None
                 if args.dry_run and new_text:
-                    print(f"  [captured {len(new_text)} chars of new text]")
-
-            if not new_text or len(new_text) < 10:
-                time.sleep(args.interval)
-                continue
-
-            # --- Filter ---
-            result = filter_with_llm(
-                new_text,
-                model=args.model,
-                ollama_url=args.ollama_url,
+                    print(f"  [pipe-pane: captured {len(new_text)} chars]")
+            else:
+                current_raw = capture_pane_raw(args.pane)
+                # Quick check: skip if pane content hasn't changed at all.
+                # Comparing the raw bytes is a memcmp and avoids decoding.
+                if current_raw == previous_raw:
+                    new_text = None
+                else:
+                    previous_raw = current_raw
+                    current_output = strip_ansi_bytes(current_raw)
+                    new_text = get_new_output(current_output, previous_output)
+                    previous_output = current_output
+                    if args.dry_run and new_text:
+                        print(f"  [captured {len(new_text)} chars of new text]")
+
+            now = time.monotonic()
+            if new_text:
+                pending.append(new_text)
+                pending_chars += len(new_text)
+                last_activity = now
+
+            # --- Announce a finished filter result ---
+            if in_flight is not None and in_flight.done():
+                result = in_flight.result()
+                if result and not args.no_cache:
+                    remember_narrated(in_flight_text)
+                _announce(result)
+                in_flight = None
+
+            # --- Filter: wait for a quiet window so bursts become one call ---
+            ready = pending and (
+                now - last_activity >= args.quiet_window or pending_chars >= _MAX_BATCH_CHARS
             )
-
-            if result:
-                narration, is_question = result
-                tag = "[Q]" if is_question else "[S]"
-                print(f"🔊 {tag} {narration}")
-                if not args.dry_run:
-                    narration_queue.enqueue(narration, is_question=is_question)
-            elif args.dry_run:
-                print("  [LLM returned SKIP]")
-
-            time.sleep(args.interval)
+            if ready and in_flight is None:
+                new_text = "\n".join(pending)
+                pending.clear()
+                pending_chars = 0
+                batches += 1
+                # Heuristic pre-filter (also drops fragments under ~15 letters)
+                if should_skip_fast(new_text):
+                    fast_skips += 1
+                    if args.dry_run:
+                        print(f"  [pre-filter SKIP ({fast_skips}/{batches} batches)]")
+                elif not args.no_cache and is_near_duplicate(new_text):
+                    if args.dry_run:
+                        print("  [near-duplicate of a recent narration, skipped]")
+                else:
+                    in_flight_text = new_text
+                    in_flight = llm_pool.submit(_classify, new_text)
+
+            # Sleep until the next capture, waking early if the LLM finishes,
+            # the piped pane produces output, or (where supported) the log
+            # file is written to
+            delay = args.quiet_window if pending else args.interval
+            if in_flight is not None:
+                wait([in_flight], timeout=delay)
+            elif pane_pipe:
+                pane_pipe.wait(delay)
+            elif log_watcher:
+                log_watcher.wait(delay)
+            else:
+                time.sleep(delay)
 
     except KeyboardInterrupt:
         pass
     finally:
+        llm_pool.shutdown(wait=False, cancel_futures=True)
+        if pane_pipe:
+            pane_pipe.close()
+        if log_watcher:
+            log_watcher.close()
         narration_queue.stop()
         cmd_listener.stop()
         if wakeword_listener:
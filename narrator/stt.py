@@ -1,6 +1,7 @@
-"""Speech-to-text via Silero VAD + mlx-whisper."""
+"""Speech-to-text via Silero VAD + mlx-whisper (faster-whisper elsewhere)."""
 
 import sys
+import threading
 import time
 from typing import Optional
 
@@ -19,22 +20,20 @@ class VoiceInput:
         self.stt_model = stt_model
         self.silence_timeout = silence_timeout
         self.listen_timeout = listen_timeout
-        self._vad_model = None
-        self._vad_utils = None
+        self._vad = None
+        # Held while warming up so a real listen waits for the models
+        self._lock = threading.Lock()
+        self._ct2_model = None
 
     # ------------------------------------------------------------------
     # Lazy model loading
     # ------------------------------------------------------------------
 
     def _ensure_vad(self):
-        if self._vad_model is not None:
+        if self._vad is not None:
             return
-        import torch
-        self._vad_model, self._vad_utils = torch.hub.load(
-            repo_or_dir="snakers4/silero-vad",
-            model="silero_vad",
-            trust_repo=True,
-        )
+        from narrator.vad import SileroVAD
+        self._vad = SileroVAD()
 
     # ------------------------------------------------------------------
     # Recording
@@ -49,14 +48,20 @@ class VoiceInput:
         normalised to [-1, 1], or None on timeout.
         """
         import sounddevice as sd
-        import torch
+
+        from narrator.vad import CHUNK_SAMPLES, INT16_SCALE, SAMPLE_RATE
         self._ensure_vad()
 
-        sample_rate = 16000
-        chunk_samples = 512  # ~32 ms at 16 kHz
+        sample_rate = SAMPLE_RATE
+        chunk_samples = CHUNK_SAMPLES  # ~32 ms at 16 kHz
         speech_threshold = 0.5
 
-        frames: list[np.ndarray] = []
+        # One buffer for the whole recording (plus a second of slack for
+        # audio already queued when the deadline passes). Each chunk is
+        # converted straight into its slot and handed to Silero from
+        # there, so the 32 ms loop allocates no audio buffers.
+        audio = np.empty(int((self.listen_timeout + 1) * sample_rate), dtype=np.float32)
+        recorded = 0
         speech_started = False
         silence_start: Optional[float] = None
         deadline = time.monotonic() + self.listen_timeout
@@ -71,19 +76,22 @@ class VoiceInput:
 
         try:
             while time.monotonic() < deadline:
+                if recorded + chunk_samples > len(audio):
+                    break
                 data, _ = stream.read(chunk_samples)
-                audio_f32 = data.flatten().astype(np.float32) / 32768.0
-                tensor = torch.from_numpy(audio_f32)
+                # Until speech starts, this slot is overwritten every chunk
+                chunk = audio[recorded:recorded + chunk_samples]
+                np.multiply(data[:, 0], INT16_SCALE, out=chunk)
 
-                confidence = self._vad_model(tensor, sample_rate).item()
+                confidence = self._vad(chunk)
 
                 if not speech_started:
                     if confidence >= speech_threshold:
                         speech_started = True
                         silence_start = None
-                        frames.append(audio_f32)
+                        recorded += chunk_samples
                 else:
-                    frames.append(audio_f32)
+                    recorded += chunk_samples
                     if confidence < speech_threshold:
                         if silence_start is None:
                             silence_start = time.monotonic()
@@ -95,20 +103,42 @@ class VoiceInput:
             stream.stop()
             stream.close()
             # Reset VAD state for next call
-            self._vad_model.reset_states()
+            self._vad.reset()
 
-        if not frames:
+        if not recorded:
             return None
 
-        return np.concatenate(frames)
+        return audio[:recorded]
 
     # ------------------------------------------------------------------
     # Transcription
     # ------------------------------------------------------------------
 
+    def _ensure_ct2(self):
+        if self._ct2_model is not None:
+            return
+        from faster_whisper import WhisperModel
+        # "mlx-community/whisper-tiny" -> "tiny"; other names pass through
+        name = self.stt_model
+        if name.startswith("mlx-community/whisper-"):
+            name = name[len("mlx-community/whisper-"):]
+        # int8 weights: half the memory traffic of fp16 on CPU
+        self._ct2_model = WhisperModel(
+            name, device="cpu", compute_type="int8", num_workers=1,
+        )
+
     def transcribe(self, audio: np.ndarray) -> str:
-        """Transcribe a float32 audio array using mlx-whisper."""
-        import mlx_whisper
+        """Transcribe a float32 audio array using mlx-whisper.
+
+        Without mlx (Intel Macs, Linux) falls back to faster-whisper with
+        int8 quantized weights, if it is installed.
+        """
+        try:
+            import mlx_whisper
+        except ImportError:
+            self._ensure_ct2()
+            segments, _ = self._ct2_model.transcribe(audio, language="en", beam_size=1)
+            return "".join(seg.text for seg in segments).strip()
 
         result = mlx_whisper.transcribe(
             audio,
@@ -121,10 +151,24 @@ class VoiceInput:
     # Convenience
     # ------------------------------------------------------------------
 
+    def warm_up(self):
+        """Load the VAD and Whisper models ahead of the first question.
+
+        Transcribes a second of silence so the Whisper import, weights load
+        and first-call compilation happen while the user is idle.
+        """
+        with self._lock:
+            try:
+                self._ensure_vad()
+                self.transcribe(np.zeros(16000, dtype=np.float32))
+            except Exception as exc:
+                print(f"Warning: voice input warm-up failed: {exc}", file=sys.stderr)
+
     def listen_and_transcribe(self) -> Optional[str]:
         """Record from the mic, then transcribe. Returns text or None."""
-        audio = self.record_utterance()
-        if audio is None or len(audio) < 1600:  # < 0.1 s
-            return None
-        text = self.transcribe(audio)
+        with self._lock:
+            audio = self.record_utterance()
+            if audio is None or len(audio) < 1600:  # < 0.1 s
+                return None
+            text = self.transcribe(audio)
         return text if text else None
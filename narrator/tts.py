@@ -1,11 +1,13 @@
 """Text-to-speech engines and narration queue."""
 
+import json
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
 import threading
-import time
+import wave
 from collections import deque
 from typing import Callable, Optional
 
@@ -22,14 +24,26 @@ _PIPER_WAV = os.path.join(
     tempfile.gettempdir(), f"narrator_piper_{os.getpid()}.wav"
 )
 
+# Piper voice loaded in-process on first use and kept for the session, so the
+# ONNX model is read from disk once instead of on every narration
+_piper_voice = None
+_piper_voice_model: Optional[str] = None
+
 # Module-level handle for the currently playing audio process (for interrupt)
 _current_audio_proc: Optional[subprocess.Popen] = None
 _audio_lock = threading.Lock()
+# Set to cut off in-process (sounddevice) playback
+_playback_stop = threading.Event()
+
+# Audio is written to the output stream in slices this long, so an
+# interrupt takes effect mid-sentence
+_PLAYBACK_SLICE_SECONDS = 0.1
 
 
 def interrupt_audio():
     """Kill any currently playing audio process."""
     global _current_audio_proc
+    _playback_stop.set()
     with _audio_lock:
         if _current_audio_proc and _current_audio_proc.poll() is None:
             _current_audio_proc.terminate()
@@ -93,22 +107,160 @@ def _play_wav(path: str):
             _current_audio_proc = None
 
 
+def _get_piper_voice(model: str):
+    """Return a cached PiperVoice for *model*, or None if the piper package isn't importable."""
+    global _piper_voice, _piper_voice_model
+    if _piper_voice is None or _piper_voice_model != model:
+        try:
+            from piper import PiperVoice
+        except ImportError:
+            return None
+        _piper_voice = PiperVoice.load(model)
+        _piper_voice_model = model
+    return _piper_voice
+
+
+def _stream_piper(voice, text: str) -> bool:
+    """Play *text* through sounddevice while Piper synthesizes it.
+
+    Piper yields audio a sentence at a time, so playback starts after the
+    first sentence instead of the whole narration, with no WAV file or
+    player process. Returns False if sounddevice/PortAudio is unavailable.
+    """
+    try:
+        import sounddevice as sd
+    except (ImportError, OSError):
+        return False
+
+    _playback_stop.clear()
+    stream = None
+    try:
+        for chunk in voice.synthesize(text):
+            if _playback_stop.is_set():
+                break
+            if stream is None:
+                stream = sd.RawOutputStream(
+                    samplerate=chunk.sample_rate,
+                    channels=chunk.sample_channels,
+                    dtype="int16",
+                )
+                stream.start()
+            audio = chunk.audio_int16_bytes
+            step = int(chunk.sample_rate * _PLAYBACK_SLICE_SECONDS) * chunk.sample_width * chunk.sample_channels
+            for start in range(0, len(audio), step):
+                if _playback_stop.is_set():
+                    break
+                stream.write(audio[start:start + step])
+    except sd.PortAudioError:
+        if stream is None:
+            return False
+    finally:
+        if stream is not None:
+            if _playback_stop.is_set():
+                stream.abort()
+            else:
+                stream.stop()
+            stream.close()
+    return True
+
+
+def _piper_sample_rate(model: str) -> int:
+    """Read the voice's sample rate from the .onnx.json next to the model."""
+    try:
+        with open(f"{model}.json") as fh:
+            return int(json.load(fh)["audio"]["sample_rate"])
+    except (OSError, ValueError, KeyError):
+        return 22050
+
+
+def _stream_piper_cli(text: str, model: str) -> bool:
+    """Pipe `piper --output_raw` straight into aplay so playback starts early.
+
+    Only on Linux with aplay (afplay can't read raw PCM from stdin).
+    Returns False if that pipeline isn't available.
+    """
+    global _current_audio_proc
+    if sys.platform.startswith(("darwin", "win")) or not shutil.which("aplay"):
+        return False
+    piper = subprocess.Popen(
+        ["piper", "--model", model, "--output_raw"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    player = None
+    try:
+        with _audio_lock:
+            _current_audio_proc = subprocess.Popen(
+                ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1",
+                 "-r", str(_piper_sample_rate(model)), "-"],
+                stdin=piper.stdout,
+            )
+            player = _current_audio_proc
+        piper.stdout.close()  # aplay holds the read end now
+        piper.stdin.write(text.encode())
+        piper.stdin.close()
+        player.wait(timeout=60)
+        piper.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        player.terminate()
+    except BrokenPipeError:
+        pass
+    finally:
+        piper.stdout.close()
+        try:
+            piper.stdin.close()
+        except BrokenPipeError:
+            pass
+        # Interrupted playback leaves piper blocked on a closed pipe
+        if piper.poll() is None:
+            piper.kill()
+        piper.wait()
+        # A piper that died part-way leaves aplay to drain and exit on EOF
+        if player is not None:
+            try:
+                player.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                player.terminate()
+                player.wait()
+        with _audio_lock:
+            _current_audio_proc = None
+    # Negative codes are signals from our own kill or an interrupted pipe
+    if piper.returncode > 0:
+        print(f"Warning: piper exited with status {piper.returncode}.", file=sys.stderr)
+    return True
+
+
 def speak_piper(text: str, model: Optional[str] = None):
     """Speak using Piper TTS (neural, high quality, local)."""
     model = model or PIPER_DEFAULT_MODEL
     try:
-        subprocess.run(
-            ["piper", "--model", model, "--output_file", _PIPER_WAV],
-            input=text.encode(),
-            capture_output=True,
-            timeout=30,
-        )
+        voice = _get_piper_voice(model)
+        if voice is not None and _stream_piper(voice, text):
+            return
+        if voice is not None:
+            with wave.open(_PIPER_WAV, "wb") as wav_file:
+                voice.synthesize_wav(text, wav_file)
+        elif _stream_piper_cli(text, model):
+            return
+        else:
+            # No Python bindings -- fall back to the piper CLI
+            subprocess.run(
+                ["piper", "--model", model, "--output_file", _PIPER_WAV],
+                input=text.encode(),
+                capture_output=True,
+                timeout=30,
+            )
         _play_wav(_PIPER_WAV)
     except FileNotFoundError:
         print("Warning: Piper not found, falling back to macOS say.", file=sys.stderr)
         speak_say(text)
     except subprocess.TimeoutExpired:
         pass
+    except Exception as exc:
+        # Bad voice model, synthesis error, PortAudio or player failure
+        print(f"Warning: Piper failed ({exc}), falling back to macOS say.", file=sys.stderr)
+        speak_say(text)
 
 
 def speak(text: str, voice: str, engine: str):
@@ -135,44 +287,71 @@ class NarrationQueue:
         self.on_question_spoken = on_question_spoken
         # Each item is (text, is_question)
         self._queue: deque[tuple[str, bool]] = deque()
-        self._lock = threading.Lock()
+        # Signalled on enqueue/stop so the worker wakes immediately
+        self._cond = threading.Condition()
         self._stop = threading.Event()
         self.paused = threading.Event()  # set = paused
+        self.speaking = threading.Event()  # set while audio is playing
         self._thread = threading.Thread(target=self._worker, daemon=True)
         self._thread.start()
 
     def enqueue(self, text: str, is_question: bool = False):
         if self.paused.is_set():
             return  # silently drop while paused
-        with self._lock:
+        with self._cond:
             # Drop stale narrations if queue is backing up
             if len(self._queue) >= self.max_pending:
                 dropped = self._queue.popleft()
                 print(f"  (skipped stale narration: {dropped[0][:60]}...)")
             self._queue.append((text, is_question))
+            self._cond.notify()
 
     def interrupt(self):
         """Stop current playback and clear pending narrations."""
-        with self._lock:
+        with self._cond:
             self._queue.clear()
         interrupt_audio()
 
+    def pause(self):
+        self.paused.set()
+
+    def resume(self):
+        with self._cond:
+            self.paused.clear()
+            self._cond.notify_all()
+
     def stop(self):
         self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
 
     def _worker(self):
-        while not self._stop.is_set():
-            if self.paused.is_set():
-                time.sleep(0.2)
-                continue
-            item = None
-            with self._lock:
-                if self._queue:
-                    item = self._queue.popleft()
-            if item:
-                text, is_question = item
+        while True:
+            with self._cond:
+                # Block until there is work and we're not paused -- no polling
+                while (not self._queue or self.paused.is_set()) and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    break
+                # Take everything that queued up behind the last narration
+                # and speak it as one utterance: one synthesis and playback
+                # instead of one per item
+                items = list(self._queue)
+                self._queue.clear()
+            text = " ".join(
+                t if t.endswith((".", "?", "!")) else f"{t}."
+                for t, _ in items
+            )
+            self.speaking.set()
+            try:
                 speak(text, self.voice, self.engine)
-                if is_question and self.on_question_spoken:
-                    self.on_question_spoken(text)
-            else:
-                time.sleep(0.1)
+            except Exception as exc:
+                # Keep the worker alive: one failed narration must not
+                # silence the rest of the session
+                print(f"Warning: narration failed: {exc}", file=sys.stderr)
+                continue
+            finally:
+                self.speaking.clear()
+            questions = [t for t, is_question in items if is_question]
+            if questions and self.on_question_spoken:
+                self.on_question_spoken(questions[-1])
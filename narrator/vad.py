@@ -0,0 +1,139 @@
+"""Silero voice activity detection via ONNX Runtime (torch.hub fallback)."""
+
+import os
+import tempfile
+import threading
+import urllib.request
+
+import numpy as np
+
+SILERO_ONNX_URL = (
+    "https://raw.githubusercontent.com/snakers4/silero-vad/master/"
+    "src/silero_vad/data/silero_vad.onnx"
+)
+SILERO_ONNX_PATH = os.path.join(
+    os.path.expanduser("~/.cache/narrator"), "silero_vad.onnx"
+)
+
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 512  # ~32 ms at 16 kHz, the size Silero expects
+# The v5 model expects the tail of the previous chunk prepended to each one
+_CONTEXT_SAMPLES = 64
+# int16 PCM -> [-1, 1). A float32 scalar keeps the multiply in a single
+# float32 pass; dividing by the Python float 32768.0 computes in float64 and
+# casts back through a buffer.
+INT16_SCALE = np.float32(1.0 / 32768.0)
+
+
+# VoiceInput and WakeWordListener may both build a SileroVAD at startup;
+# only one of them should download the model
+_load_lock = threading.Lock()
+
+
+def _load_onnx_session():
+    """Return an onnxruntime session for Silero VAD, or None if unavailable."""
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return None
+    with _load_lock:
+        if not os.path.exists(SILERO_ONNX_PATH):
+            cache_dir = os.path.dirname(SILERO_ONNX_PATH)
+            os.makedirs(cache_dir, exist_ok=True)
+            # Unique temp name, so an interrupted or concurrent download is
+            # never mistaken for the finished file
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".part")
+            os.close(fd)
+            try:
+                urllib.request.urlretrieve(SILERO_ONNX_URL, tmp_path)
+                os.replace(tmp_path, SILERO_ONNX_PATH)
+            except OSError:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                return None
+        opts = ort.SessionOptions()
+        # A ~2 MB model on 512 samples: thread fan-out costs more than it saves
+        opts.intra_op_num_threads = 1
+        opts.inter_op_num_threads = 1
+        try:
+            return ort.InferenceSession(
+                SILERO_ONNX_PATH, sess_options=opts, providers=["CPUExecutionProvider"]
+            )
+        except Exception:
+            # Corrupt or incompatible file: fall back to torch.hub
+            return None
+
+
+class SileroVAD:
+    """Speech probability for consecutive 512-sample float32 chunks at 16 kHz.
+
+    Runs the ONNX export under onnxruntime (already installed with Piper),
+    which avoids loading torch. Falls back to the torch.hub model if
+    onnxruntime or the model file isn't available.
+    """
+
+    def __init__(self):
+        self._session = _load_onnx_session()
+        self._model = None
+        if self._session is None:
+            import torch
+            self._torch = torch
+            self._model, _ = torch.hub.load(
+                repo_or_dir="snakers4/silero-vad",
+                model="silero_vad",
+                trust_repo=True,
+            )
+        self._sr = np.array(SAMPLE_RATE, dtype=np.int64)
+        # Scaled audio waiting to fill a window, for feed()
+        self._pending = np.empty(0, dtype=np.float32)
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        # Model input is [previous context | current chunk], reused per call
+        self._input = np.zeros((1, _CONTEXT_SAMPLES + CHUNK_SAMPLES), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Clear the recurrent state between utterances."""
+        self._pending_len = 0
+        if self._model is not None:
+            self._model.reset_states()
+            return
+        # In place, so a reset allocates nothing
+        self._state.fill(0)
+        self._input.fill(0)
+
+    def __call__(self, chunk: np.ndarray) -> float:
+        if self._model is not None:
+            return self._model(self._torch.from_numpy(chunk), SAMPLE_RATE).item()
+        self._input[0, _CONTEXT_SAMPLES:] = chunk
+        out, self._state = self._session.run(
+            None, {"input": self._input, "state": self._state, "sr": self._sr}
+        )
+        self._input[0, :_CONTEXT_SAMPLES] = self._input[0, -_CONTEXT_SAMPLES:]
+        return float(out[0, 0])
+
+    def feed(self, pcm: np.ndarray) -> float:
+        """Score int16 PCM of any length and return the highest probability.
+
+        Splits it into windows internally; a trailing partial window is kept
+        and completed by the next call, so consecutive blocks are scored as
+        one continuous stream. Returns 0.0 if no window completed.
+        """
+        n = len(pcm)
+        if len(self._pending) < CHUNK_SAMPLES + n:
+            # Grow, keeping the carried partial window
+            grown = np.empty(CHUNK_SAMPLES + n, dtype=np.float32)
+            grown[:self._pending_len] = self._pending[:self._pending_len]
+            self._pending = grown
+        pending = self._pending
+        end = self._pending_len + n
+        np.multiply(pcm, INT16_SCALE, out=pending[self._pending_len:end])
+        best = 0.0
+        start = 0
+        while end - start >= CHUNK_SAMPLES:
+            best = max(best, self(pending[start:start + CHUNK_SAMPLES]))
+            start += CHUNK_SAMPLES
+        self._pending_len = end - start
+        pending[:self._pending_len] = pending[start:end]
+        return best
@@ -1,10 +1,31 @@
 """Wake word detection using openWakeWord with optional speech interrupt."""
 
+import gc
+import os
+import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional
 
-import numpy as np
+# Blocks whose int16 peak stays under this (about -44 dBFS) are treated as
+# silence and never reach the VAD
+_QUIET_PEAK = 200
+
+
+def _raise_thread_priority():
+    """Best-effort bump of the calling thread's scheduling priority.
+
+    On Linux, setpriority() on a thread id only affects that thread, so
+    the audio loop wakes promptly while the LLM and TTS threads are busy.
+    Lowering niceness needs CAP_SYS_NICE; without it this is a no-op.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), -5)
+    except OSError:
+        pass
 
 
 class WakeWordListener:
@@ -16,13 +37,20 @@ class WakeWordListener:
         on_wake: Optional[Callable[[], None]] = None,
         on_speech_interrupt: Optional[Callable[[], None]] = None,
         threshold: float = 0.5,
+        tts_active: Optional[threading.Event] = None,
     ):
         self.wake_phrase = wake_phrase
         self.on_wake = on_wake
         self.on_speech_interrupt = on_speech_interrupt
         self.threshold = threshold
+        # Set while narration is playing; speech can only interrupt then, so
+        # the VAD is skipped otherwise. None runs it all the time.
+        self.tts_active = tts_active
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        # One long-lived worker runs on_wake, so a detection doesn't spawn
+        # a thread on the audio loop
+        self._wake_exec: Optional[ThreadPoolExecutor] = None
         self._oww_model = None
         self._vad_model = None
 
@@ -38,16 +66,13 @@ class WakeWordListener:
 
         # Silero VAD for speech-based interrupt detection
         if self.on_speech_interrupt:
-            import torch
-            self._vad_model, _ = torch.hub.load(
-                repo_or_dir="snakers4/silero-vad",
-                model="silero_vad",
-                trust_repo=True,
-            )
+            from narrator.vad import SileroVAD
+            self._vad_model = SileroVAD()
 
     def start(self):
         """Start wake word detection in a background thread."""
         self._stop.clear()
+        self._wake_exec = ThreadPoolExecutor(max_workers=1)
         self._thread = threading.Thread(target=self._listen_loop, daemon=True)
         self._thread.start()
 
@@ -56,16 +81,19 @@ class WakeWordListener:
         self._stop.set()
         if self._thread:
             self._thread.join(timeout=2)
+        if self._wake_exec:
+            self._wake_exec.shutdown(wait=False)
 
     def _listen_loop(self):
         import sounddevice as sd
 
         self._ensure_models()
-
-        if self.on_speech_interrupt:
-            import torch
-        else:
-            torch = None
+        _raise_thread_priority()
+        # The models are loaded; move everything allocated so far into the
+        # permanent generation so a full collection doesn't rescan it
+        # mid-block. Like any gc setting this applies to the whole process;
+        # unlike gc.disable() it leaves collection running for new garbage.
+        gc.freeze()
 
         sample_rate = 16000
         # openWakeWord expects 1280-sample chunks (80 ms at 16 kHz)
@@ -80,38 +108,57 @@ class WakeWordListener:
             blocksize=chunk_samples,
         )
         stream.start()
+        # Bound once so the per-block path only touches locals
+        predict = self._oww_model.predict
+        reset_wake = self._oww_model.reset
+        vad = self._vad_model if self.on_speech_interrupt else None
+        on_interrupt = self.on_speech_interrupt
+        threshold = self.threshold
+        tts_active = self.tts_active
+        vad_fed = False
 
         try:
             while not self._stop.is_set():
                 data, _ = stream.read(chunk_samples)
-                audio_i16 = data.flatten()
-
-                # Feed openWakeWord
-                prediction = self._oww_model.predict(audio_i16)
+                # Mono, so the column is already a contiguous view
+                audio_i16 = data[:, 0]
 
                 now = time.monotonic()
-                for name, score in prediction.items():
-                    if score >= self.threshold and now >= cooldown_until:
+                # Detections are ignored during the cooldown, so don't run
+                # the model at all; the stream is still read to keep it drained
+                if now >= cooldown_until:
+                    prediction = predict(audio_i16)
+                    if max(prediction.values(), default=0.0) >= threshold:
                         cooldown_until = now + 3.0  # 3 s cooldown
+                        # Drop the buffered wake phrase so the first frames
+                        # after the cooldown aren't scored against it
+                        reset_wake()
                         if self.on_wake:
-                            threading.Thread(
-                                target=self.on_wake, daemon=True
-                            ).start()
-                        break
+                            self._wake_exec.submit(self.on_wake)
 
                 # VAD-based interrupt: detect user speech during TTS
-                if self._vad_model and self.on_speech_interrupt and now >= interrupt_cooldown:
-                    audio_f32 = audio_i16.astype(np.float32) / 32768.0
-                    # Silero VAD needs 512-sample chunks
-                    for i in range(0, len(audio_f32) - 511, 512):
-                        chunk = torch.from_numpy(audio_f32[i:i + 512])
-                        conf = self._vad_model(chunk, sample_rate).item()
-                        if conf >= 0.7:
-                            self.on_speech_interrupt()
-                            interrupt_cooldown = now + 2.0  # 2 s cooldown
-                            break
+                listening = (
+                    vad is not None
+                    and now >= interrupt_cooldown
+                    and (tts_active is None or tts_active.is_set())
+                )
+                # Near-silent blocks skip the model entirely
+                loud = listening and (
+                    audio_i16.max() >= _QUIET_PEAK or audio_i16.min() <= -_QUIET_PEAK
+                )
+                if loud:
+                    vad_fed = True
+                    if vad.feed(audio_i16) >= 0.7:
+                        on_interrupt()
+                        interrupt_cooldown = now + 2.0  # 2 s cooldown
+                        loud = False
+                if vad_fed and not loud:
+                    # Listening stopped or a quiet block was skipped, so the
+                    # stream is broken; restart it once, on the transition
+                    vad.reset()
+                    vad_fed = False
         finally:
             stream.stop()
             stream.close()
             if self._vad_model:
-                self._vad_model.reset_states()
+                self._vad_model.reset()
@@ -0,0 +1,22 @@
+import unittest
+
+from narrator.capture import get_new_output
+
+
+class GetNewOutputTest(unittest.TestCase):
+    def test_redraw_above_padding_keeps_new_lines(self):
+        padding = "\n" * 30
+        previous = "build started\ncompiling\n⠋ working" + padding
+        current = "build started\ncompiling\n⠙ done\nDo you want to proceed?" + padding
+        self.assertEqual(
+            get_new_output(current, previous),
+            "⠙ done\nDo you want to proceed?",
+        )
+
+
+    def test_trailing_spaces_on_last_line_keep_the_anchor(self):
+        self.assertEqual(get_new_output("x\n$ \nfoo\n$ ", "x\n$ "), "foo\n$")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import unittest
+from unittest import mock
+
+from narrator import llm
+from narrator.llm import (
+    filter_with_llm,
+    is_near_duplicate,
+    remember_narrated,
+    should_skip_fast,
+)
+
+
+class ShouldSkipFastTest(unittest.TestCase):
+    def test_short_yes_no_prompts_reach_the_llm(self):
+        for prompt in (
+            "Continue? [Y/n]",
+            "Proceed? y/n",
+            "Run tests? (y/n)",
+            "Allow? (y/n)",
+        ):
+            with self.subTest(prompt=prompt):
+                self.assertFalse(should_skip_fast(prompt))
+
+    def test_short_summaries_reach_the_llm(self):
+        for summary in (
+            "I fixed the bug in parse_args. The CLI now accepts --verbose.",
+            "I've refactored the auth module and added tests for the login flow.",
+            "All tests pass. Ready for the next task.",
+            "Claude needs your input on the migration strategy.",
+            "Pick a database:\n1. PostgreSQL\n2. DynamoDB\n3. SQLite",
+            "Moved the helpers out. Renamed the module. Dropped the old shim.",
+        ):
+            with self.subTest(summary=summary):
+                self.assertFalse(should_skip_fast(summary))
+
+    def test_one_line_traceback_reaches_the_llm(self):
+        for line in (
+            "ValueError: invalid literal for int() with base 10: 'abc'",
+            "requests.exceptions.ConnectionError: Max retries exceeded",
+            "Traceback (most recent call last): main.py line 3",
+        ):
+            with self.subTest(line=line):
+                self.assertFalse(should_skip_fast(line))
+
+    def test_short_tool_output_is_skipped(self):
+        self.assertTrue(should_skip_fast("drwxr-xr-x  src\ndrwxr-xr-x  docs\nREADME.md"))
+
+    def test_bare_prompt_is_skipped(self):
+        self.assertTrue(should_skip_fast("$ "))
+
+
+class NearDuplicateTest(unittest.TestCase):
+    def setUp(self):
+        llm._recent_narrated.clear()
+
+    def test_repaint_is_duplicate(self):
+        remember_narrated("Claude created three files and updated the README")
+        self.assertTrue(is_near_duplicate("Claude created three files and updated the README"))
+
+    def test_repeated_prompt_is_never_duplicate(self):
+        prompt = "Claude wants to run npm test. Allow? (y/n)"
+        remember_narrated(prompt)
+        self.assertFalse(is_near_duplicate(prompt))
+
+    def test_entries_expire(self):
+        text = "Claude created three files and updated the README"
+        remember_narrated(text)
+        later = llm.time.monotonic() + llm._NEAR_DUP_WINDOW + 1
+        with mock.patch.object(llm.time, "monotonic", return_value=later):
+            self.assertFalse(is_near_duplicate(text))
+
+
+class _StreamedReply:
+    """Stands in for a streamed Ollama /api/chat response."""
+
+    def __init__(self, *pieces, lines=None):
+        self._lines = lines or [
+            json.dumps({"message": {"content": p}, "done": i == len(pieces) - 1}).encode()
+            for i, p in enumerate(pieces)
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+
+class FilterWithLlmTest(unittest.TestCase):
+    def _filter(self, *pieces):
+        with mock.patch.object(llm._SESSION, "post", return_value=_StreamedReply(*pieces)):
+            return filter_with_llm("Claude finished the build.", use_cache=False)
+
+    def test_skip_reply(self):
+        self.assertIsNone(self._filter("SK", "IP"))
+
+    def test_narration_starting_with_skip_is_spoken(self):
+        self.assertEqual(
+            self._filter("Skip", "ped 3 flaky tests, build passed."),
+            ("Skipped 3 flaky tests, build passed.", False),
+        )
+
+
+    def test_error_chunk_is_not_cached_as_skip(self):
+        llm._cache.clear()
+        error = _StreamedReply(lines=[json.dumps({"error": "model 'x' not found"}).encode()])
+        with mock.patch.object(llm._SESSION, "post", return_value=error), \
+                mock.patch("sys.stderr"):
+            self.assertIsNone(filter_with_llm("Claude finished the build."))
+        self.assertEqual(len(llm._cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()